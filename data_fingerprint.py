@@ -1,58 +1,204 @@
+import numpy as np
 import pandas as pd
 import hashlib
+import io
 import sys
 import os
 import csv
+import itertools
+import mmap
+import re
 import warnings
-
-def detect_delimiter(file_path):
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Minimum number of rows before row hashing is spread over a thread pool
+PARALLEL_HASH_MIN_ROWS = 50000
+# Minimum average row length in bytes before row hashing is spread over a thread pool: hashlib only
+# releases the GIL for inputs of at least 2 KiB, so shorter rows are hashed one at a time anyway
+PARALLEL_HASH_MIN_ROW_BYTES = 2048
+
+# Number of bytes sampled from the start of a CSV file to detect its delimiter and decimal separator
+CSV_SAMPLE_SIZE = 65536
+
+# Numeric dtypes rounded during normalization
+ROUNDED_DTYPES = ('float64', 'float32', 'int64', 'int32')
+
+# Number of rows read per chunk by the streaming fingerprint functions
+STREAMING_CHUNK_SIZE = 200000
+
+# Values the C parser reads as booleans: 'true' and 'false' in any letter case
+CSV_TRUE_VALUES = [''.join(chars) for chars in itertools.product(*zip('true', 'TRUE'))]
+CSV_FALSE_VALUES = [''.join(chars) for chars in itertools.product(*zip('false', 'FALSE'))]
+
+
+# Preferred datetime formats, used to resolve day/month ambiguity when guessing a column's format
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%d-%m-%Y %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%d-%m-%Y %H:%M',
+    '%Y-%m-%d',
+    '%d-%m-%Y',
+    '%m/%d/%Y %H:%M:%S',
+    '%m/%d/%Y %H:%M',
+    '%d/%m/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M'
+]
+
+def read_csv_sample(file_path):
     """
-    Detects the delimiter used in a CSV file by sampling the first few lines.
+    Reads the start of a CSV file once so it can be shared by the delimiter and decimal detection.
+    Only complete lines are returned.
     """
-    with open(file_path, 'r', encoding='utf-8') as csvfile:
-        sample = csvfile.read(2048)
-        # Use Sniffer to detect the delimiter
-        sniffer = csv.Sniffer()
-        try:
-            dialect = sniffer.sniff(sample, delimiters=[',', ';', '\t', '|'])
-            delimiter = dialect.delimiter
-           # print(f"Detected delimiter: '{delimiter}'")
-        except csv.Error:
-            # Default to comma if Sniffer fails
-            delimiter = ','
-            print("Could not detect delimiter. Defaulting to comma.")
+    with open(file_path, 'rb') as csvfile:
+        head = csvfile.read(CSV_SAMPLE_SIZE)
+    if len(head) == CSV_SAMPLE_SIZE and b'\n' in head:
+        # Drop the trailing line that may have been cut off by the sample size
+        head = head[:head.rindex(b'\n') + 1]
+    return head.decode('utf-8', 'replace')
+
+def detect_delimiter(sample):
+    """
+    Detects the delimiter used in a CSV file from a sample of its first few lines.
+    """
+    # Use Sniffer to detect the delimiter
+    sniffer = csv.Sniffer()
+    try:
+        dialect = sniffer.sniff(sample[:2048], delimiters=[',', ';', '\t', '|'])
+        delimiter = dialect.delimiter
+       # print(f"Detected delimiter: '{delimiter}'")
+    except csv.Error:
+        # Default to comma if Sniffer fails
+        delimiter = ','
+        print("Could not detect delimiter. Defaulting to comma.")
     return delimiter
 
-def detect_decimal_separator(file_path, delimiter):
-    """
-    Detects the decimal separator in a CSV file by sampling numeric data.
-    """
-    decimal_separators = [',', '.']
-    decimal_counts = {',': 0, '.': 0}
-
-    with open(file_path, 'r', encoding='utf-8') as csvfile:
-        reader = csv.reader(csvfile, delimiter=delimiter)
-        # Skip header
-        headers = next(reader, None)
-        for _ in range(10):  # Sample first 10 data rows
-            try:
-                row = next(reader)
-            except StopIteration:
-                break
-            if row:
-                for value in row:
-                    # Remove non-digit characters except decimal separators
-                    value_no_sep = ''.join(c for c in value if c.isdigit() or c in decimal_separators)
-                    # Check for decimal separators
-                    for sep in decimal_separators:
-                        if sep in value_no_sep:
-                            parts = value_no_sep.split(sep)
-                            if len(parts) == 2 and all(part.isdigit() for part in parts):
-                                decimal_counts[sep] += 1
-        # Determine the most frequent decimal separator
-        detected_decimal = max(decimal_counts, key=decimal_counts.get)
-        # print(f"Detected decimal separator: '{detected_decimal}'")
-        return detected_decimal
+def detect_decimal_separator(sample, delimiter):
+    """
+    Detects the decimal separator in a CSV file by scanning numeric data in a sample of the file.
+    """
+    # Skip header
+    sample = sample.split('\n', 1)[1] if '\n' in sample else ''
+
+    # Match whole numeric fields only; unquoted fields cannot contain the delimiter itself
+    d = re.escape(delimiter)
+    seps = ''.join(sep for sep in '.,' if sep != delimiter)
+    pattern = rf'(?:^|(?<={d})) *(?:"[-+]?\d+([.,])\d+"|[-+]?\d+([{seps}])\d+) *(?={d}|\r?$)'
+    toks = [quoted or unquoted for quoted, unquoted in re.findall(pattern, sample, flags=re.MULTILINE)]
+
+    # Determine the most frequent decimal separator
+    dots = toks.count('.')
+    commas = toks.count(',')
+    detected_decimal = '.' if dots >= commas else ','
+    # print(f"Detected decimal separator: '{detected_decimal}'")
+    return detected_decimal
+
+def pyarrow_csv_options(delimiter, decimal_sep):
+    """
+    Returns the PyArrow parse and convert options that read a CSV file the way the default C parser does.
+    """
+    import pyarrow.csv as pa_csv
+    from pandas._libs.parsers import STR_NA_VALUES
+
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter)
+    convert_options = pa_csv.ConvertOptions(
+        decimal_point=decimal_sep,
+        null_values=sorted(STR_NA_VALUES),
+        strings_can_be_null=True,
+        true_values=CSV_TRUE_VALUES,
+        false_values=CSV_FALSE_VALUES,
+        # A format that never matches keeps datetimes as text, as the C parser does
+        timestamp_parsers=['\x01']
+    )
+    return parse_options, convert_options
+
+def csv_number_prefixes(file_path, delimiter):
+    """
+    Returns True if a field of a CSV file starts with a number with a '+' sign or a hexadecimal 0x prefix.
+    PyArrow reads '+1' as a float and '0x10' as 16, where the C parser reads an integer and keeps the text.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Scanning for the bytes alone is fast, so the fields are only checked if they occur
+            patterns = []
+            if mm.find(b'+') != -1:
+                patterns.append(rb'\+[0-9.]')
+            if mm.find(b'0x') != -1 or mm.find(b'0X') != -1:
+                patterns.append(rb'0[xX][0-9a-fA-F]')
+            if not patterns:
+                return False
+
+            field_starts = (delimiter.encode()[0], ord('\n'), ord('\r'))
+            for match in re.finditer(b'|'.join(patterns), mm):
+                # Skip the blanks and opening quote PyArrow allows before a number
+                i = match.start() - 1
+                while i >= 0 and mm[i] in b' \t"':
+                    i -= 1
+                if i < 0 or mm[i] in field_starts:
+                    return True
+    return False
+
+def float_integer_overflow(numbers):
+    """
+    Returns whether every value of a PyArrow float array is a whole number and whether any is outside the
+    int64 range. An array meeting both may hold integers too large for int64, which PyArrow reads as floats
+    and the C parser as uint64 or text.
+    """
+    import pyarrow.compute as pc
+
+    whole = not pc.any(pc.not_equal(pc.floor(numbers), numbers), min_count=0).as_py()
+    large = pc.any(pc.greater_equal(pc.abs(numbers), 2.0 ** 63), min_count=0).as_py()
+    return whole, large
+
+def text_column_types(schema):
+    """
+    Maps the columns of a PyArrow schema with a type the C parser does not produce, such as dates
+    and times, to the string type, so that they are read as text.
+    """
+    import pyarrow as pa
+
+    return {
+        field.name: pa.string() for field in schema
+        if not (pa.types.is_string(field.type) or pa.types.is_integer(field.type)
+                or pa.types.is_floating(field.type) or pa.types.is_boolean(field.type)
+                or pa.types.is_null(field.type))
+    }
+
+def read_csv_fast(file_path, delimiter, decimal_sep):
+    """
+    Reads a CSV file with the multithreaded PyArrow parser, falling back to the default C parser
+    if PyArrow is not installed or reads the file differently.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        if not csv_number_prefixes(file_path, delimiter):
+            parse_options, convert_options = pyarrow_csv_options(delimiter, decimal_sep)
+            # The types inferred from the first block pin dates and times to text before the full read
+            with pa_csv.open_csv(file_path, parse_options=parse_options, convert_options=convert_options) as reader:
+                schema = reader.schema
+            if len(set(schema.names)) == len(schema.names):
+                convert_options.column_types = text_column_types(schema)
+                table = pa_csv.read_csv(file_path, parse_options=parse_options, convert_options=convert_options)
+                # A date or time first seen after the first block still needs the column read again as text
+                text_columns = text_column_types(table.schema)
+                if text_columns:
+                    convert_options.column_types = {**convert_options.column_types, **text_columns}
+                    table = pa_csv.read_csv(file_path, parse_options=parse_options, convert_options=convert_options)
+                overflow = any(
+                    all(float_integer_overflow(column))
+                    for column in table.columns if pa.types.is_floating(column.type)
+                )
+                if not overflow:
+                    return table.to_pandas()
+    except Exception:
+        pass
+    # Duplicate column names are left to pandas, which deduplicates them
+    return pd.read_csv(file_path, delimiter=delimiter, decimal=decimal_sep, engine='c')
 
 def enforce_data_types(df):
     """
@@ -83,67 +229,126 @@ def enforce_data_types(df):
 
 
 
+def load_csv(file_path):
+    """
+    Loads a CSV file, detecting its delimiter and decimal separator.
+    """
+    # Read the start of the file once for both detections
+    sample = read_csv_sample(file_path)
+    # Detect delimiter
+    delimiter = detect_delimiter(sample)
+    # Detect decimal separator
+    decimal_sep = detect_decimal_separator(sample, delimiter)
+    # Read the CSV with the detected delimiter and decimal separator
+    return read_csv_fast(file_path, delimiter, decimal_sep)
+
+def load_json(file_path):
+    """
+    Loads a JSON file, leaving date strings to be parsed by the standardization step.
+    """
+    return pd.read_json(file_path, convert_dates=False)
+
+def load_html(file_path):
+    """
+    Loads the first table of an HTML file.
+    """
+    df_list = pd.read_html(file_path)
+    if not df_list:
+        raise ValueError("No tables found in HTML file.")
+    return df_list[0]
+
+# Loader for each supported file extension
+LOADERS = {
+    '.csv': load_csv,
+    '.xlsx': pd.read_excel,
+    '.xls': pd.read_excel,
+    '.json': load_json,
+    '.parquet': pd.read_parquet,
+    '.feather': pd.read_feather,
+    '.h5': pd.read_hdf,
+    '.hdf': pd.read_hdf,
+    '.hdf5': pd.read_hdf,
+    '.pkl': pd.read_pickle,
+    '.pickle': pd.read_pickle,
+    '.dta': pd.read_stata,
+    '.sas7bdat': pd.read_sas,
+    '.sav': pd.read_spss,
+    '.xml': pd.read_xml,
+    '.html': load_html
+}
+
+# Leading bytes identifying binary file formats, checked when the extension is unknown or wrong
+FILE_SIGNATURES = [
+    (b'PK\x03\x04', pd.read_excel),  # xlsx (zip container)
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', pd.read_excel),  # xls (OLE2 container)
+    (b'PAR1', pd.read_parquet),
+    (b'ARROW1', pd.read_feather),
+    (b'FEA1', pd.read_feather),
+    (b'\x89HDF\r\n\x1a\n', pd.read_hdf),
+    (b'<stata_dta>', pd.read_stata),
+    (b'$FL2', pd.read_spss),
+    (b'$FL3', pd.read_spss),
+    (b'\x00' * 12 + b'\xc2\xea\x81\x60\xb3\x14\x11\xcf\xbd\x92\x08\x00\x09\xc7\x31\x8c\x18\x1f\x10\x11', pd.read_sas),
+    (b'\x80\x02', pd.read_pickle),
+    (b'\x80\x03', pd.read_pickle),
+    (b'\x80\x04', pd.read_pickle),
+    (b'\x80\x05', pd.read_pickle)
+]
+
+# Leading text identifying text file formats, matched case-insensitively after whitespace and BOM
+TEXT_SIGNATURES = [
+    (b'<?xml', pd.read_xml),
+    (b'<!doctype html', load_html),
+    (b'<html', load_html),
+    (b'<table', load_html),
+    (b'{', load_json),
+    (b'[', load_json)
+]
+
+def detect_loader(file_path):
+    """
+    Picks a loader from the leading bytes of the file. Returns None if no known signature matches.
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(64)
+    for signature, loader in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return loader
+    text_head = head.lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    for signature, loader in TEXT_SIGNATURES:
+        if text_head.startswith(signature):
+            return loader
+    return None
+
 def load_data(file_path):
     """
     Attempts to load a dataset from the given file path, trying multiple file formats.
     """
     df = None
     _, ext = os.path.splitext(file_path)
-    ext = ext.lower()
+    loader = LOADERS.get(ext.lower())
     try:
-        if ext == '.csv':
-            # Detect delimiter
-            delimiter = detect_delimiter(file_path)
-            # Detect decimal separator
-            decimal_sep = detect_decimal_separator(file_path, delimiter)
-            # Read the CSV with the detected delimiter and decimal separator
-            df = pd.read_csv(file_path, delimiter=delimiter, decimal=decimal_sep)
-            # print(f"Loaded CSV with '{delimiter}' as delimiter and '{decimal_sep}' as decimal separator.")
-        elif ext in ['.xlsx', '.xls']:
-            df = pd.read_excel(file_path)
-            # print("Loaded Excel file.")
-        elif ext == '.json':
-            df = pd.read_json(file_path, convert_dates=False)
-            # print("Loaded JSON file.")
-        elif ext == '.parquet':
-            df = pd.read_parquet(file_path)
-            # print("Loaded Parquet file.")
-        elif ext == '.feather':
-            df = pd.read_feather(file_path)
-            # print("Loaded Feather file.")
-        elif ext in ['.h5', '.hdf', '.hdf5']:
-            df = pd.read_hdf(file_path)
-            # print("Loaded HDF5 file.")
-        elif ext in ['.pkl', '.pickle']:
-            df = pd.read_pickle(file_path)
-            # print("Loaded Pickle file.")
-        elif ext == '.dta':
-            df = pd.read_stata(file_path)
-            # print("Loaded Stata file.")
-        elif ext == '.sas7bdat':
-            df = pd.read_sas(file_path)
-            # print("Loaded SAS file.")
-        elif ext == '.sav':
-            df = pd.read_spss(file_path)
-            # print("Loaded SPSS file.")
-        elif ext == '.xml':
-            df = pd.read_xml(file_path)
-            # print("Loaded XML file.")
-        elif ext == '.html':
-            df_list = pd.read_html(file_path)
-            if df_list:
-                df = df_list[0]
-                # print("Loaded HTML file.")
-            else:
-                raise ValueError("No tables found in HTML file.")
+        if loader is None:
+            # If extension is unknown, identify the format from the file signature
+            # print("Unknown file extension. Checking the file signature...")
+            loader = detect_loader(file_path)
+        if loader is not None:
+            df = loader(file_path)
         else:
-            # If extension is unknown, try to load it using common formats
-            # print("Unknown file extension. Attempting to read the file in common formats...")
+            # If no signature matches, try to load it using common formats
             df = try_loading_with_guesses(file_path)
     except Exception as e:
         print(f"Error loading file based on extension: {e}")
-        # If failed, try loading with guesses
-        df = try_loading_with_guesses(file_path)
+        # The extension may be wrong, so check the file signature before trying every format
+        try:
+            signature_loader = detect_loader(file_path)
+            if signature_loader is not None and signature_loader is not loader:
+                df = signature_loader(file_path)
+        except Exception as e:
+            print(f"Error loading file based on signature: {e}")
+        if df is None:
+            # If failed, try loading with guesses
+            df = try_loading_with_guesses(file_path)
     if df is None:
         raise ValueError("Could not read the data file in any known format.")
 
@@ -187,47 +392,164 @@ def try_loading_with_guesses(file_path):
             print(f"Failed to load file as {format_name}: {e}")
     return None
 
-def standardize_datetime_columns(df, date_only=False):
+def datetime_format_pattern(fmt):
+    """
+    Converts a strftime format made of %Y, %m, %d, %H, %M and %S fields into a regular expression.
+    """
+    return re.sub(
+        r'%([YmdHMS])|([^%]+)',
+        lambda m: (r'\d{4}' if m.group(1) == 'Y' else r'\d{1,2}') if m.group(1) else re.escape(m.group(2)),
+        fmt
+    )
+
+# Preferred datetime formats grouped by the shape of the text they match, in order of preference
+DATETIME_SHAPES = {}
+for _fmt in DATETIME_FORMATS:
+    DATETIME_SHAPES.setdefault(datetime_format_pattern(_fmt), []).append(_fmt)
+del _fmt
+
+# Single regular expression matching any of the preferred datetime formats, one named group per shape
+DATETIME_RE = re.compile('|'.join(
+    f'(?P<shape{i}>{pattern})' for i, pattern in enumerate(DATETIME_SHAPES)
+))
+DATETIME_SHAPE_FORMATS = dict(zip((f'shape{i}' for i in range(len(DATETIME_SHAPES))), DATETIME_SHAPES.values()))
+
+def guess_column_datetime_formats(series):
+    """
+    Guesses candidate datetime formats of a column from its first non-missing value, in preference order.
+    Returns an empty list if the value does not look like a datetime.
+    """
+    sample = series.dropna()
+    if sample.empty or not isinstance(sample.iat[0], str):
+        return []
+    sample = sample.iat[0].strip()
+
+    # Only the preferred formats must fit every value; other columns are left to inference.
+    # Every format of the shape that fits the value is a candidate, so a later value can still
+    # settle an ambiguous day/month order
+    match = DATETIME_RE.fullmatch(sample)
+    if match is None:
+        return []
+    formats = []
+    for fmt in DATETIME_SHAPE_FORMATS[match.lastgroup]:
+        try:
+            datetime.strptime(sample, fmt)
+            formats.append(fmt)
+        except ValueError:
+            continue
+    return formats
+
+def parse_datetime_with_format(series, fmt):
+    """
+    Parses a column with the given datetime format.
+    Returns None unless every non-missing value matches the format.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=UserWarning)
+        parsed_col = pd.to_datetime(series, format=fmt, errors='coerce')
+    if parsed_col.notnull().sum() != series.notnull().sum():
+        return None
+    return parsed_col
+
+def classify_columns(df):
+    """
+    Splits the columns into object, rounded numeric and datetime columns with a single pass over the dtypes.
+    """
+    object_cols = []
+    numeric_cols = []
+    datetime_cols = []
+    for col, dtype in df.dtypes.items():
+        # pandas 3 'str' columns are selected as object, as select_dtypes(include=['object']) does
+        if dtype == object or (isinstance(dtype, pd.StringDtype) and dtype.na_value is np.nan):
+            object_cols.append(col)
+        # Nullable (Int64) and Arrow-backed (double[pyarrow]) columns match their numpy counterparts,
+        # as in select_dtypes
+        elif getattr(dtype, 'numpy_dtype', dtype).name in ROUNDED_DTYPES:
+            numeric_cols.append(col)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            datetime_cols.append(col)
+    return object_cols, numeric_cols, datetime_cols
+
+def detect_datetime_formats(chunks):
+    """
+    Detects the datetime columns of a DataFrame given as a sequence of chunks, choosing the formats
+    standardize_datetime_columns would choose for the chunks concatenated.
+    Returns the column_formats for standardize_datetime_columns; 'mixed' parses values one by one.
+    """
+    # pandas internals used by to_datetime to pick the format it infers; imported here so a move
+    # in a later pandas release only affects the streaming functions
+    from pandas._libs.tslib import first_non_null
+    from pandas.core.tools.datetimes import _guess_datetime_format_for_array
+
+    # Preferred formats that fit every value so far, guessed from the first non-missing value
+    candidates = {}
+    # Format pandas infers from the first non-missing value, and the number of values it parses
+    inferred = {}
+    rows = 0
+    for chunk in chunks:
+        rows += len(chunk)
+        object_cols, _, _ = classify_columns(chunk)
+        for col in object_cols:
+            series = chunk[col]
+            if col not in candidates and series.notna().any():
+                candidates[col] = guess_column_datetime_formats(series)
+            if col in candidates:
+                candidates[col] = [
+                    fmt for fmt in candidates[col] if parse_datetime_with_format(series, fmt) is not None
+                ]
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", category=UserWarning)
+                if col not in inferred:
+                    values = np.asarray(series, dtype=object)
+                    if first_non_null(values) != -1:
+                        inferred[col] = [_guess_datetime_format_for_array(values) or 'mixed', 0]
+                if col in inferred:
+                    parsed_col = pd.to_datetime(series, format=inferred[col][0], errors='coerce')
+                    inferred[col][1] += parsed_col.notnull().sum()
+
+    column_formats = {col: formats[0] for col, formats in candidates.items() if formats}
+    for col, (fmt, parsed) in inferred.items():
+        # Columns without a preferred format are datetimes if inference parses at least 80% of the rows
+        if col not in column_formats and parsed / rows >= 0.8:
+            column_formats[col] = fmt
+    return column_formats
+
+def standardize_datetime_columns(df, date_only=False, column_formats=None):
     """
     Identifies datetime columns and standardizes their format.
     If date_only is True, formats to 'YYYY-MM-DD'. Otherwise, includes time.
+    If column_formats is given, only the object columns it maps to a format are parsed, and nothing is detected.
     """
     # Identify columns with datetime data types
-    datetime_cols = df.select_dtypes(include=['datetime', 'datetime64[ns]', 'datetimetz']).columns.tolist()
+    object_cols, _, datetime_cols = classify_columns(df)
 
     # For object columns, attempt to parse as datetime
-    object_cols = df.select_dtypes(include=['object']).columns.tolist()
     potential_datetime_cols = []
 
-    # Define possible datetime formats
-    datetime_formats = [
-        '%Y-%m-%d %H:%M:%S',
-        '%d-%m-%Y %H:%M:%S',
-        '%Y-%m-%d %H:%M',
-        '%d-%m-%Y %H:%M',
-        '%Y-%m-%d',
-        '%d-%m-%Y',
-        '%m/%d/%Y %H:%M:%S',
-        '%m/%d/%Y %H:%M',
-        '%d/%m/%Y %H:%M:%S',
-        '%d/%m/%Y %H:%M'
-    ]
+    if column_formats is not None:
+        # Formats detected over the whole file by detect_datetime_formats; other columns stay text
+        for col in object_cols:
+            if col in column_formats:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", category=UserWarning)
+                    df[col] = pd.to_datetime(df[col], format=column_formats[col], errors='coerce')
+                potential_datetime_cols.append(col)
+    else:
+        # Attempt to parse object columns as datetime
+        for col in object_cols:
+            parsed_col = None
+            # Try the candidate formats in order until one fits every value
+            for fmt in guess_column_datetime_formats(df[col]):
+                parsed_col = parse_datetime_with_format(df[col], fmt)
+                if parsed_col is not None:
+                    break
+            if parsed_col is not None:
+                df[col] = parsed_col
+                potential_datetime_cols.append(col)
+                # print(f"Parsed '{col}' as datetime with format '{fmt}'.")
+                continue
 
-    # Attempt to parse object columns as datetime
-    for col in object_cols:
-        parsed_col = None
-        for fmt in datetime_formats:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", category=UserWarning)
-                try:
-                    parsed_col = pd.to_datetime(df[col], format=fmt, errors='raise')
-                    df[col] = parsed_col
-                    potential_datetime_cols.append(col)
-                    # print(f"Parsed '{col}' as datetime with format '{fmt}'.")
-                    break  # Stop if parsing is successful
-                except Exception:
-                    continue
-        if parsed_col is None:
             # Try to parse without specifying the format
             parsed_col = pd.to_datetime(df[col], errors='coerce')
             if parsed_col.notnull().mean() >= 0.8:
@@ -247,28 +569,43 @@ def standardize_datetime_columns(df, date_only=False):
 
     return df
 
+def sort_columns_and_reset_index(df):
+    """
+    Sorts the columns by name and resets the index to a default RangeIndex.
+    Either step is skipped if the DataFrame already satisfies it.
+    """
+    sorted_cols = sorted(df.columns)
+    if list(df.columns) != sorted_cols:
+        df = df.reindex(sorted_cols, axis=1)
+
+    index = df.index
+    if not (isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1):
+        df = df.reset_index(drop=True)
+    return df
+
 def standardize_dataframe(df):
     """
     Applies standardization steps to the DataFrame, similar to the fingerprinting functions.
     """
+    # Work on a shallow copy so the caller's DataFrame is left untouched
+    df = df.copy(deep=False)
+
     # Enforce data types
     df = enforce_data_types(df)
 
     # Standardize datetime columns
     df = standardize_datetime_columns(df)
 
-    # Ensure consistent column order
-    df = df.reindex(sorted(df.columns), axis=1)
+    # Ensure consistent column order and reset index
+    df = sort_columns_and_reset_index(df)
 
-    # Reset index
-    df = df.reset_index(drop=True)
+    string_cols, numeric_cols, _ = classify_columns(df)
 
     # Strip whitespace from string columns
-    string_cols = df.select_dtypes(include=['object']).columns
-    df[string_cols] = df[string_cols].apply(lambda x: x.str.strip())
+    for col in string_cols:
+        df[col] = df[col].str.strip()
 
     # Round numeric columns
-    numeric_cols = df.select_dtypes(include=['float64', 'float32', 'int64', 'int32']).columns
     df[numeric_cols] = df[numeric_cols].round(6)
 
     # Fill NaN values and convert all data to strings
@@ -276,94 +613,381 @@ def standardize_dataframe(df):
 
     return df
 
-def generate_order_dependent_fingerprint(df):
+def get_hash_function(hash_algo='sha256'):
     """
-    Generates an order-dependent fingerprint of the DataFrame.
+    Returns the constructor of the hash object for the given algorithm, 'sha256' or 'blake3'.
+    SHA-256 is the default; BLAKE3 fingerprints differ from SHA-256 ones and require the optional blake3 package.
     """
+    if hash_algo == 'sha256':
+        return hashlib.sha256
+    if hash_algo == 'blake3':
+        try:
+            from blake3 import blake3
+        except ImportError:
+            raise ImportError("The 'blake3' hash algorithm requires the blake3 package: pip install blake3")
+        return blake3
+    raise ValueError(f"Unsupported hash algorithm: {hash_algo}")
+
+def hash_chunk(data, starts, ends, hash_algo='sha256'):
+    """
+    Hashes the rows of a chunk, given as start and end offsets into data, and returns the binary digests.
+    """
+    hash_function = get_hash_function(hash_algo)
+    return [hash_function(data[start:end]).digest() for start, end in zip(starts.tolist(), ends.tolist())]
+
+def hash_rows(data, starts, ends, hash_algo='sha256'):
+    """
+    Hashes serialized rows, splitting inputs of many long rows into contiguous chunks hashed on a thread pool.
+    OpenSSL and BLAKE3 release the GIL while hashing rows of at least 2 KiB, so threads run the chunks concurrently.
+    """
+    workers = os.cpu_count() or 1
+    if (workers == 1 or len(starts) < PARALLEL_HASH_MIN_ROWS
+            or (ends - starts).mean() < PARALLEL_HASH_MIN_ROW_BYTES):
+        return hash_chunk(data, starts, ends, hash_algo)
+
+    start_slices = np.array_split(starts, workers)
+    end_slices = np.array_split(ends, workers)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        parts = list(ex.map(hash_chunk, [data] * workers, start_slices, end_slices, [hash_algo] * workers))
+    return [digest for part in parts for digest in part]
+
+def fill_and_stringify(df):
+    """
+    Fills NaN values with empty strings and converts the data to strings, as df.fillna('').astype(str) does.
+    float64, int64 and int32 columns are left numeric: to_csv with na_rep='' writes them as the same text
+    using its vectorized formatter, which avoids a per-cell Python cast.
+    """
+    native_dtypes = ('float64', 'int64', 'int32')
+    for i, dtype in enumerate(df.dtypes):
+        if dtype.name not in native_dtypes:
+            df.isetitem(i, df.iloc[:, i].fillna('').astype(str))
+    return df
+
+def serialize_rows(df):
+    """
+    Serializes each row of the DataFrame to CSV bytes.
+    The frame is written once into a single buffer, returned with the start and end offsets of each row.
+    """
+    buf = io.BytesIO()
+    df.to_csv(buf, index=False, header=False, lineterminator='\n', na_rep='', encoding='utf-8')
+    data = buf.getbuffer()
+
+    # Row boundaries are the positions of the line terminators
+    raw = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(raw == ord('\n'))
+    if len(ends) != len(df):
+        # Quoted values containing newlines span several lines. Quotes inside a quoted value are doubled,
+        # so a newline ends a row only when an even number of quotes precede it (parity survives uint8 wrap-around)
+        quotes_before = np.cumsum(raw == ord('"'), dtype=np.uint8)[ends]
+        ends = ends[quotes_before % 2 == 0]
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    return data, starts, ends
+
+def normalize_for_fingerprint(df, column_formats=None):
+    """
+    Applies the normalization steps shared by the fingerprinting functions and returns a new DataFrame
+    ready to be serialized. The caller's DataFrame is left untouched.
+    column_formats is passed on to standardize_datetime_columns.
+    """
+    # Work on a shallow copy so the caller's DataFrame is left untouched
+    df = df.copy(deep=False)
+
     # Enforce data types
     df = enforce_data_types(df)
 
     # Standardize datetime columns
-    df = standardize_datetime_columns(df)
+    df = standardize_datetime_columns(df, column_formats=column_formats)
 
-    # Ensure consistent column order
-    df = df.reindex(sorted(df.columns), axis=1)
+    # Ensure consistent column order and reset index
+    df = sort_columns_and_reset_index(df)
 
-    # Reset index
-    df = df.reset_index(drop=True)
+    string_cols, numeric_cols, _ = classify_columns(df)
 
     # Strip whitespace from string columns
-    string_cols = df.select_dtypes(include=['object']).columns
-    df[string_cols] = df[string_cols].apply(lambda x: x.str.strip())
+    for col in string_cols:
+        df[col] = df[col].str.strip()
 
     # Round numeric columns
-    numeric_cols = df.select_dtypes(include=['float64', 'float32', 'int64', 'int32']).columns
     df[numeric_cols] = df[numeric_cols].round(6)
 
-    # Convert all data to strings
-    df = df.fillna('').astype(str)
-
-    # Serialize data without index and header
-    data_string = df.to_csv(index=False, header=False, lineterminator='\n')
+    # Handle NaN values and convert all data to strings
+    df = fill_and_stringify(df)
 
-    # Hash the serialized data using SHA-256
-    hash_object = hashlib.sha256(data_string.encode('utf-8'))
-    fingerprint = hash_object.hexdigest()
-    return fingerprint
+    return df
 
-def generate_order_independent_fingerprint(df):
+def combine_row_hashes(row_hashes, hash_algo='sha256'):
     """
-    Generates an order-independent fingerprint of the DataFrame.
+    Combines 32-byte row hashes into an order-independent fingerprint.
     """
-    # Enforce data types
-    df = enforce_data_types(df)
+    # Sort row hashes to ensure order-independence, as fixed-width 32-byte strings so the sort runs in NumPy
+    digests = np.frombuffer(b''.join(row_hashes), dtype='S32').copy()
+    digests.sort()
 
-    # Standardize datetime columns
-    df = standardize_datetime_columns(df)
+    # Generate final fingerprint from the concatenated row hashes
+    h = get_hash_function(hash_algo)()
+    h.update(memoryview(digests.tobytes()))
+    return h.hexdigest()
 
-    # Reset index and sort columns to ensure consistent order
-    df = df.reindex(sorted(df.columns), axis=1)
-    df = df.reset_index(drop=True)
+def generate_order_dependent_fingerprint(df, hash_algo='sha256'):
+    """
+    Generates an order-dependent fingerprint of the DataFrame.
+    hash_algo selects the hash function, 'sha256' (default) or 'blake3'.
+    """
+    df = normalize_for_fingerprint(df)
 
-    # Strip whitespace from string columns
-    string_cols = df.select_dtypes(include=['object']).columns
-    df[string_cols] = df[string_cols].apply(lambda x: x.str.strip())
+    # Serialize data without index and header
+    data_bytes = df.to_csv(index=False, header=False, lineterminator='\n', na_rep='').encode('utf-8')
 
-    # Round numeric columns
-    numeric_cols = df.select_dtypes(include=['float64', 'float32', 'int64', 'int32']).columns
-    df[numeric_cols] = df[numeric_cols].round(6)
+    # Hash the serialized data in a single update over one contiguous buffer
+    h = get_hash_function(hash_algo)()
+    h.update(memoryview(data_bytes))
+    return h.hexdigest()
 
-    # Handle NaN values and convert all data to strings
-    df = df.fillna('').astype(str)
+def generate_order_independent_fingerprint(df, hash_algo='sha256'):
+    """
+    Generates an order-independent fingerprint of the DataFrame.
+    hash_algo selects the hash function, 'sha256' (default) or 'blake3'.
+    """
+    df = normalize_for_fingerprint(df)
 
-    # Serialize each row into a string
-    row_strings = df.apply(lambda row: ','.join(row.values), axis=1)
+    # Serialize each row into bytes
+    data, starts, ends = serialize_rows(df)
 
     # Hash each row individually
-    row_hashes = row_strings.apply(lambda x: hashlib.sha256(x.encode('utf-8')).hexdigest())
+    row_hashes = hash_rows(data, starts, ends, hash_algo)
 
-    # Sort row hashes to ensure order-independence
-    row_hashes = sorted(row_hashes)
+    return combine_row_hashes(row_hashes, hash_algo)
 
-    # Concatenate all row hashes
-    concatenated_hashes = ''.join(row_hashes)
-
-    # Generate final fingerprint
-    final_hash = hashlib.sha256(concatenated_hashes.encode('utf-8')).hexdigest()
-    return final_hash
-
-def process_file_with_order_dependent_fingerprint(file_path):
+def process_file_with_order_dependent_fingerprint(file_path, hash_algo='sha256'):
     """
     Processes a file and returns its order-dependent fingerprint.
     """
     df = load_data(file_path)
-    fingerprint = generate_order_dependent_fingerprint(df)
+    fingerprint = generate_order_dependent_fingerprint(df, hash_algo)
     return fingerprint
 
-def process_file_with_order_independent_fingerprint(file_path):
+def process_file_with_order_independent_fingerprint(file_path, hash_algo='sha256'):
     """
     Processes a file and returns its order-independent fingerprint.
     """
     df = load_data(file_path)
-    fingerprint = generate_order_independent_fingerprint(df)
-    return fingerprint
\ No newline at end of file
+    fingerprint = generate_order_independent_fingerprint(df, hash_algo)
+    return fingerprint
+
+def convert_csv_values(values, kind, decimal_sep):
+    """
+    Converts a text array without missing values to kind, one of 'int64', 'bool', 'double' or 'string',
+    as PyArrow's CSV reader does. Returns None if a value does not convert.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if kind == 'string':
+        return values
+    if kind == 'bool':
+        if not pc.all(pc.is_in(values, value_set=pa.array(CSV_TRUE_VALUES + CSV_FALSE_VALUES))).as_py():
+            return None
+        return pc.is_in(values, value_set=pa.array(CSV_TRUE_VALUES))
+
+    # Numbers may be padded with spaces or tabs
+    values = pc.utf8_trim(values, characters=' \t')
+    if kind == 'double' and decimal_sep != '.':
+        if pc.any(pc.match_substring(values, '.')).as_py():
+            return None
+        values = pc.replace_substring(values, decimal_sep, '.')
+    try:
+        return pc.cast(values, pa.int64() if kind == 'int64' else pa.float64())
+    except pa.ArrowInvalid:
+        return None
+
+def infer_csv_column_types(file_path, delimiter, decimal_sep):
+    """
+    Infers the column types read_csv_fast gives a CSV file, reading it block by block as text so only one
+    block is held in memory. PyArrow's streaming reader alone would fix the types from the first block.
+    Returns the PyArrow type of each column and the pandas dtypes of the integer and boolean columns
+    with missing values, or None if the column names are not unique or read_csv_fast would fall back
+    to the C parser.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    if csv_number_prefixes(file_path, delimiter):
+        return None
+
+    parse_options, convert_options = pyarrow_csv_options(delimiter, decimal_sep)
+    with pa_csv.open_csv(file_path, parse_options=parse_options, convert_options=convert_options) as reader:
+        names = reader.schema.names
+    if len(set(names)) != len(names):
+        return None
+
+    # As PyArrow does, give each column the first kind that converts all of its values.
+    # Dates and times are left as text, as read_csv_fast leaves them
+    kinds = {name: ['null', 'int64', 'bool', 'double', 'string'] for name in names}
+    has_nulls = dict.fromkeys(names, False)
+    # Whether the values read as floats are all whole numbers, and whether any is outside the int64 range
+    whole = dict.fromkeys(names, True)
+    large = dict.fromkeys(names, False)
+    convert_options.column_types = {name: pa.string() for name in names}
+    with pa_csv.open_csv(file_path, parse_options=parse_options, convert_options=convert_options) as reader:
+        for batch in reader:
+            for name, column in zip(names, batch.columns):
+                has_nulls[name] = has_nulls[name] or column.null_count > 0
+                values = column.drop_null()
+                if not len(values) or kinds[name][0] == 'string':
+                    continue
+                fits = []
+                for kind in kinds[name]:
+                    if kind == 'null':
+                        continue
+                    converted = convert_csv_values(values, kind, decimal_sep)
+                    if converted is None:
+                        continue
+                    fits.append(kind)
+                    if kind == 'double':
+                        batch_whole, batch_large = float_integer_overflow(converted)
+                        whole[name] = whole[name] and batch_whole
+                        large[name] = large[name] or batch_large
+                kinds[name] = fits
+
+    # Integers that overflow int64 send read_csv_fast to the C parser
+    if any(kinds[name][0] == 'double' and whole[name] and large[name] for name in names):
+        return None
+
+    kind_types = {'null': pa.null(), 'int64': pa.int64(), 'bool': pa.bool_(), 'double': pa.float64(), 'string': pa.string()}
+    column_types = {name: kind_types[kinds[name][0]] for name in names}
+    # to_pandas reads integer columns with missing values as floats and boolean ones as objects
+    dtypes = {
+        name: 'float64' if kinds[name][0] == 'int64' else object
+        for name in names if has_nulls[name] and kinds[name][0] in ('int64', 'bool')
+    }
+    return column_types, dtypes
+
+def detect_csv_format(file_path):
+    """
+    Detects the delimiter, decimal separator and column types of a CSV file for read_csv_chunks.
+    Returns None if PyArrow is not installed or cannot read the file in chunks.
+    """
+    sample = read_csv_sample(file_path)
+    delimiter = detect_delimiter(sample)
+    decimal_sep = detect_decimal_separator(sample, delimiter)
+    try:
+        types = infer_csv_column_types(file_path, delimiter, decimal_sep)
+    except Exception:
+        return None
+    if types is None:
+        return None
+    return (delimiter, decimal_sep) + types
+
+def read_csv_chunks(file_path, csv_format, chunksize=STREAMING_CHUNK_SIZE):
+    """
+    Reads a CSV file in DataFrames of chunksize rows with the parser of read_csv_fast, using the csv_format
+    returned by detect_csv_format, so every chunk has the dtypes load_csv gives the whole file.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    delimiter, decimal_sep, column_types, dtypes = csv_format
+    parse_options, convert_options = pyarrow_csv_options(delimiter, decimal_sep)
+    convert_options.column_types = column_types
+    with pa_csv.open_csv(file_path, parse_options=parse_options, convert_options=convert_options) as reader:
+        batches = []
+        rows = 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            while rows >= chunksize:
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                yield table.slice(0, chunksize).to_pandas().astype(dtypes)
+                table = table.slice(chunksize)
+                batches = table.to_batches()
+                rows = table.num_rows
+        if rows:
+            yield pa.Table.from_batches(batches, schema=reader.schema).to_pandas().astype(dtypes)
+
+def normalized_csv_chunks(file_path, csv_format, chunksize=STREAMING_CHUNK_SIZE):
+    """
+    Yields the chunks of a CSV file normalized as normalize_for_fingerprint normalizes the whole file.
+    The datetime columns are detected in a pass over the file before the first chunk is yielded.
+    """
+    column_formats = detect_datetime_formats(
+        enforce_data_types(chunk) for chunk in read_csv_chunks(file_path, csv_format, chunksize)
+    )
+    for chunk in read_csv_chunks(file_path, csv_format, chunksize):
+        yield normalize_for_fingerprint(chunk, column_formats=column_formats)
+
+def process_file_with_order_dependent_fingerprint_streaming(file_path, chunksize=STREAMING_CHUNK_SIZE, hash_algo='sha256'):
+    """
+    Processes a CSV file chunk by chunk and returns its order-dependent fingerprint.
+    Only one chunk is held in memory at a time. Other file formats, and CSV files PyArrow cannot
+    read in chunks, are loaded in full.
+    """
+    csv_format = None
+    if os.path.splitext(file_path)[1].lower() == '.csv':
+        csv_format = detect_csv_format(file_path)
+    if csv_format is None:
+        return process_file_with_order_dependent_fingerprint(file_path, hash_algo)
+
+    h = get_hash_function(hash_algo)()
+    for chunk in normalized_csv_chunks(file_path, csv_format, chunksize):
+        h.update(chunk.to_csv(index=False, header=False, lineterminator='\n', na_rep='').encode('utf-8'))
+    return h.hexdigest()
+
+def process_file_with_order_independent_fingerprint_streaming(file_path, chunksize=STREAMING_CHUNK_SIZE, hash_algo='sha256'):
+    """
+    Processes a CSV file chunk by chunk and returns its order-independent fingerprint.
+    Only one chunk and the row hashes are held in memory at a time. Other file formats, and CSV files
+    PyArrow cannot read in chunks, are loaded in full.
+    """
+    csv_format = None
+    if os.path.splitext(file_path)[1].lower() == '.csv':
+        csv_format = detect_csv_format(file_path)
+    if csv_format is None:
+        return process_file_with_order_independent_fingerprint(file_path, hash_algo)
+
+    row_hashes = []
+    for chunk in normalized_csv_chunks(file_path, csv_format, chunksize):
+        row_hashes.extend(hash_rows(*serialize_rows(chunk), hash_algo=hash_algo))
+    return combine_row_hashes(row_hashes, hash_algo)
+
+def raw_bytes_fingerprint(file_path, hash_algo='sha256'):
+    """
+    Computes the hash of the raw file bytes without loading the data into pandas.
+    Unlike the other fingerprints, this changes with the file format, delimiter or line endings.
+    """
+    h = get_hash_function(hash_algo)()
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return h.hexdigest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as mv:
+                h.update(mv)
+    return h.hexdigest()
+
+def main():
+    """
+    Entry point of the script. Handles user input and displays the resulting fingerprint.
+    Pass --raw to hash the file bytes directly, skipping data normalization.
+    """
+    if '--raw' in sys.argv[1:]:
+        file_path = input("Enter the file path of the dataset: ").strip()
+        print(f"Raw file fingerprint: {raw_bytes_fingerprint(file_path)}")
+        return
+
+    print("Select fingerprinting mode:")
+    print("1. Order-Dependent")
+    print("2. Order-Independent")
+    choice = input("Enter your choice (1 or 2): ").strip()
+    if choice not in ('1', '2'):
+        print("Invalid choice. Please enter 1 or 2.")
+        return
+
+    file_path = input("Enter the file path of the dataset: ").strip()
+    if choice == '1':
+        print(f"Order-dependent fingerprint: {process_file_with_order_dependent_fingerprint(file_path)}")
+    else:
+        print(f"Order-independent fingerprint: {process_file_with_order_independent_fingerprint(file_path)}")
+
+if __name__ == '__main__':
+    main()